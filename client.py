@@ -1,16 +1,21 @@
 import os
 import json
 import sys
+import hashlib
 import argparse
-import socket
 import subprocess
 import time
 
-import numpy as np
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numpy and scoring are imported inside the search/index functions so
+# trivial commands (--help, --stop, --list, --remove) start without the
+# numpy import tax; see the matching note in shared.py.
 
 from shared import (
-    DAEMON_HOST,
-    DAEMON_PORT,
     CENTRAL_INDEX_STORE,
     DEFAULT_INDEX,
     DEFAULT_THRESHOLD,
@@ -20,8 +25,23 @@ from shared import (
     SKIP_DIRS,
     chunk_text,
     get_model,
-    cosine_similarity,
-    hybrid_boost,
+    get_query_vec,
+    encode_texts,
+    normalize_vectors,
+    hybrid_boost_batch,
+    dedup_top_k,
+    save_index,
+    load_index,
+    index_exists,
+    index_size_bytes,
+    index_mtime,
+    delete_index_files,
+    list_store_indices,
+    daemon_connect,
+    send_frame,
+    recv_frame,
+    pack_message,
+    unpack_message,
     try_daemon_reload,
     try_daemon_stop,
 )
@@ -57,17 +77,43 @@ def start_daemon(vault_path):
         return False
 
 
+# One warm connection is kept for the life of the CLI process so retries
+# and follow-up requests skip the connect cost.
+_daemon_sock = None
+
+
+def _get_daemon_conn(timeout):
+    global _daemon_sock
+    if _daemon_sock is None:
+        _daemon_sock = daemon_connect(timeout)
+    else:
+        _daemon_sock.settimeout(timeout)
+    return _daemon_sock
+
+
+def _close_daemon_conn():
+    global _daemon_sock
+    if _daemon_sock is not None:
+        try:
+            _daemon_sock.close()
+        except OSError:
+            pass
+        _daemon_sock = None
+
+
 def _send_daemon_request(request, timeout=0.2):
     """Send a JSON request to the daemon and return the parsed response.
 
-    Returns None on any connection or protocol error.
+    Uses the cached connection when one is open; any error tears it down
+    so the next call reconnects cleanly.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(timeout)
-        s.connect((DAEMON_HOST, DAEMON_PORT))
-        s.sendall(json.dumps(request).encode('utf-8'))
-        response = s.recv(131072).decode('utf-8', errors='replace')
-        return json.loads(response)
+    try:
+        s = _get_daemon_conn(timeout)
+        send_frame(s, pack_message(request))
+        return unpack_message(recv_frame(s))
+    except Exception:
+        _close_daemon_conn()
+        raise
 
 
 def try_daemon_search(query, scope=None, index=None, threshold=DEFAULT_THRESHOLD,
@@ -110,7 +156,74 @@ def try_daemon_search(query, scope=None, index=None, threshold=DEFAULT_THRESHOLD
     return None
 
 
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _parse_ajson_line(line):
+    """Parse one .ajson record line into ``(key, val)``, or None.
+
+    Lines without an "embeddings" payload are rejected on a substring
+    check before any JSON decoding. The fast path splits on the key's
+    closing quote+colon and decodes key and value separately — no dict
+    wrapping, one less allocation per record. Records that defeat the
+    split (e.g. escaped quotes in the key) fall back to the old wrapped
+    parse.
+    """
+    if '"embeddings"' not in line:
+        return None
+    line = line.strip()
+    if line.endswith(","):
+        line = line[:-1]
+    if not line:
+        return None
+
+    idx = line.find('":')
+    try:
+        if idx > 0:
+            return _json_loads(line[:idx + 1]), _json_loads(line[idx + 2:])
+        raise ValueError("no key delimiter")
+    except ValueError:
+        try:
+            data = json.loads("{" + line + "}")
+        except json.JSONDecodeError:
+            return None
+        for key, val in data.items():
+            return key, val
+        return None
+
+
+def _parse_ajson_file(file_path):
+    """Extract ``(paths, vectors)`` from one .ajson file.
+
+    Module-level (not a closure) so ProcessPoolExecutor can pickle it.
+    """
+    paths = []
+    vectors = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parsed = _parse_ajson_line(line)
+            if parsed is None:
+                continue
+            key, val = parsed
+            if not isinstance(val, dict) or "embeddings" not in val:
+                continue
+
+            found_vec = None
+            for mod_key, mod_val in val["embeddings"].items():
+                if "TaylorAI" in mod_key and "vec" in mod_val:
+                    found_vec = mod_val["vec"]
+                    break
+
+            if found_vec:
+                path = val.get("path") or str(key).replace("smart_sources:", "").replace("smart_blocks:", "")
+                paths.append(path)
+                vectors.append(found_vec)
+    return paths, vectors
+
+
 def refresh_cache(vault_path, cache_path):
+    import numpy as np
+
     multi_path = os.path.join(vault_path, ".smart-env", "multi")
 
     paths = []
@@ -121,36 +234,29 @@ def refresh_cache(vault_path, cache_path):
         print(f"Error: Multi-path not found at {multi_path}")
         return
 
-    for filename in os.listdir(multi_path):
-        if filename.endswith(".ajson"):
-            file_path = os.path.join(multi_path, filename)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if line.endswith(","):
-                        line = line[:-1]
-                    try:
-                        content = "{" + line + "}"
-                        data = json.loads(content)
-                        for key, val in data.items():
-                            if isinstance(val, dict) and "embeddings" in val:
-                                embeds = val["embeddings"]
-                                found_vec = None
-                                for mod_key, mod_val in embeds.items():
-                                    if "TaylorAI" in mod_key and "vec" in mod_val:
-                                        found_vec = mod_val["vec"]
-                                        break
-
-                                if found_vec:
-                                    path = val.get("path") or key.replace("smart_sources:", "").replace("smart_blocks:", "")
-                                    paths.append(path)
-                                    vectors.append(found_vec)
-                    except (json.JSONDecodeError, KeyError, ValueError):
-                        continue
-
-    np.savez_compressed(cache_path, paths=np.array(paths), vectors=np.array(vectors))
+    ajson_files = [os.path.join(multi_path, f)
+                   for f in os.listdir(multi_path) if f.endswith(".ajson")]
+
+    # JSON parsing is CPU-bound and holds the GIL, so spread the files
+    # across processes; a single file isn't worth the pool spin-up.
+    if len(ajson_files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for p, v in ex.map(_parse_ajson_file, ajson_files):
+                paths.extend(p)
+                vectors.extend(v)
+    else:
+        for file_path in ajson_files:
+            p, v = _parse_ajson_file(file_path)
+            paths.extend(p)
+            vectors.extend(v)
+
+    if not vectors:
+        print(f"No embeddings found in {multi_path}; cache not updated.")
+        return
+
+    vectors = normalize_vectors(np.array(vectors))
+    save_index(cache_path, paths, vectors)
     print(f"Cache saved to {cache_path} ({len(paths)} vectors)")
 
     if try_daemon_reload():
@@ -160,52 +266,83 @@ def refresh_cache(vault_path, cache_path):
 def search_indexed_files(query, indices, top_k=20, threshold=DEFAULT_THRESHOLD,
                          scope=None, hybrid=False):
     """Search indexed files. If hybrid=True, boost scores for keyword matches."""
+    import numpy as np
+    from scoring import cosine_scores
+
     all_results = []
-    model = None
-    query_vec = None
     query_words = query.lower().split() if hybrid else []
 
+    # First pass: load every cache and record offsets so all indices can be
+    # scored with a single matrix-vector product instead of K small ones.
+    labels = []
+    paths_list = []
+    vectors_list = []
+    offsets = [0]
+
     for label, cache_path in indices:
-        if not os.path.exists(cache_path):
+        if not index_exists(cache_path):
             continue
 
         try:
-            data = np.load(cache_path, allow_pickle=False)
-            paths = data["paths"]
-            vectors = data["vectors"]
+            paths, vectors, normalized = load_index(cache_path)
+            # Legacy caches get unit-normalized here so the whole batch
+            # shares the dot-only scoring path and a common fp16 dtype.
+            if not normalized:
+                vectors = normalize_vectors(vectors)
+            labels.append(label)
+            paths_list.append(paths)
+            vectors_list.append(vectors)
+            offsets.append(offsets[-1] + len(vectors))
+        except Exception as e:
+            print(f"Error loading {label}: {e}", file=sys.stderr)
 
-            if model is None:
-                model = get_model()
-                query_vec = model.encode(query)
+    if not vectors_list:
+        return []
 
-            scores = cosine_similarity(query_vec, vectors)
+    query_vec = get_query_vec(query)
 
-            for i, score in enumerate(scores):
-                path = str(paths[i])
-                effective_score = float(score)
+    all_vectors = vectors_list[0] if len(vectors_list) == 1 else np.concatenate(vectors_list, axis=0)
+    scores = cosine_scores(query_vec, all_vectors, normalized=True)
 
-                if hybrid:
-                    effective_score = min(1.0, effective_score + hybrid_boost(path, query_words))
+    # Boosts apply to every row before any ranking: an exact filename
+    # match (+0.4) can pull a low raw score to the top, so partitioning
+    # on raw scores would silently drop it. The daemon orders these
+    # steps the same way.
+    if hybrid:
+        all_paths = (np.asarray(paths_list[0]) if len(paths_list) == 1
+                     else np.concatenate([np.asarray(p) for p in paths_list]))
+        boosts = hybrid_boost_batch(all_paths, query_words)
+        effective = np.minimum(1.0, scores.astype(np.float32, copy=False) + boosts)
+    else:
+        effective = scores
+
+    # Narrow to a small candidate set before touching any paths: an O(N)
+    # argpartition in C replaces the O(N) Python loop. 4× top_k leaves
+    # headroom for dedup and scope filtering to discard candidates.
+    k = min(len(effective), top_k * 4)
+    top_idx = np.argpartition(effective, -k)[-k:]
+    top_idx = top_idx[effective[top_idx] >= threshold]
+    if top_idx.size == 0:
+        # np.array([]) would be float64 and break the np.char ops below.
+        return []
 
-                if effective_score >= threshold:
-                    if not scope or scope.lower() in path.lower():
-                        all_results.append({"path": path, "score": effective_score, "index": label})
-        except Exception as e:
-            print(f"Error loading {label}: {e}", file=sys.stderr)
+    offsets = np.array(offsets)
+    which = np.searchsorted(offsets, top_idx, side="right") - 1
+    cand_paths = np.array([str(paths_list[w][i - offsets[w]])
+                           for w, i in zip(which, top_idx)])
 
-    all_results.sort(key=lambda x: x["score"], reverse=True)
+    eff = effective[top_idx]
+    keep = np.ones(len(top_idx), dtype=bool)
+    if scope:
+        keep = np.char.find(np.char.lower(cand_paths), scope.lower()) >= 0
+    for j in np.nonzero(keep)[0]:
+        all_results.append({"path": str(cand_paths[j]),
+                            "score": float(eff[j]),
+                            "index": labels[which[j]]})
 
-    # Deduplicate
-    seen = set()
-    unique = []
-    for r in all_results:
-        if r["path"] not in seen:
-            unique.append(r)
-            seen.add(r["path"])
-        if len(unique) >= top_k:
-            break
+    all_results.sort(key=lambda x: x["score"], reverse=True)
 
-    return unique
+    return dedup_top_k(all_results, top_k)
 
 
 def get_cache_name_for_path(dir_path):
@@ -215,26 +352,49 @@ def get_cache_name_for_path(dir_path):
     return f"autoscan_{safe_name[:100]}"
 
 
+def _read_file_if_small(file_path):
+    """Read one candidate file, returning ``(path, content, mtime)``.
+
+    Returns None for oversized, empty, or unreadable files. Runs on a
+    thread pool — the GIL is released during the blocking stat/read
+    syscalls, so reads overlap.
+    """
+    try:
+        st = os.stat(file_path)
+        if st.st_size > MAX_FILE_SIZE:
+            print(f"Skipping large file ({st.st_size} bytes): {file_path}", file=sys.stderr)
+            return None
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        if not content.strip():
+            return None
+        return file_path, content, st.st_mtime
+    except OSError:
+        return None
+
+
 def search_unindexed_directory(query, dir_path, top_k=20, threshold=DEFAULT_THRESHOLD):
     """Scan and index a directory. Caches results for future searches."""
+    import numpy as np
+    from scoring import cosine_scores
+
     cache_name = get_cache_name_for_path(dir_path)
-    cache_path = os.path.join(CENTRAL_INDEX_STORE, f"{cache_name}.npz")
+    cache_path = os.path.join(CENTRAL_INDEX_STORE, cache_name)
 
-    if os.path.exists(cache_path):
+    if index_exists(cache_path):
         print(f"Using cached index: {cache_name}", file=sys.stderr)
         try:
-            data = np.load(cache_path, allow_pickle=False)
-            paths = data["paths"]
-            vectors = data["vectors"]
-
-            model = get_model()
-            query_vec = model.encode(query)
-            scores = cosine_similarity(query_vec, vectors)
-
-            results = []
-            for i, score in enumerate(scores):
-                if score >= threshold:
-                    results.append({"path": str(paths[i]), "score": float(score), "index": cache_name})
+            paths, vectors, normalized = load_index(cache_path)
+
+            query_vec = get_query_vec(query)
+            scores = cosine_scores(query_vec, vectors, normalized=normalized)
+
+            k = min(len(scores), top_k * 4)
+            top_idx = np.argpartition(scores, -k)[-k:]
+            top_idx = top_idx[scores[top_idx] >= threshold]
+
+            results = [{"path": str(paths[i]), "score": float(scores[i]), "index": cache_name}
+                       for i in top_idx]
             results.sort(key=lambda x: x["score"], reverse=True)
             return results[:top_k]
         except (OSError, ValueError) as e:
@@ -242,66 +402,126 @@ def search_unindexed_directory(query, dir_path, top_k=20, threshold=DEFAULT_THRE
 
     # No cache — scan, chunk, and embed
     print(f"Scanning unindexed directory: {dir_path}...", file=sys.stderr)
-    file_paths = []
-    file_texts = []
 
+    candidate_paths = []
     for root, dirs, files in os.walk(dir_path):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         for file in files:
             if file.endswith(INDEXABLE_EXTENSIONS):
-                file_path = os.path.join(root, file)
-                try:
-                    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-                        print(f"Skipping large file ({os.path.getsize(file_path)} bytes): {file_path}", file=sys.stderr)
-                        continue
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                        if content.strip():
-                            file_paths.append(file_path)
-                            file_texts.append(content)
-                except OSError:
-                    continue
+                candidate_paths.append(os.path.join(root, file))
+
+    # Reads are pure I/O wait — overlap them on a thread pool so the scan
+    # runs at the filesystem's real concurrency instead of one syscall at
+    # a time. map() preserves discovery order.
+    file_paths = []
+    file_texts = []
+    file_mtimes = []
+    if candidate_paths:
+        from concurrent.futures import ThreadPoolExecutor
+        workers = min(32, len(candidate_paths))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for result in ex.map(_read_file_if_small, candidate_paths):
+                if result is not None:
+                    file_paths.append(result[0])
+                    file_texts.append(result[1])
+                    file_mtimes.append(result[2])
 
     if not file_paths:
         return []
 
-    # Chunk files for sharper embeddings
+    # Per-file embedding cache: unchanged files reuse their stored chunk
+    # vectors instead of going through the model again. Files are keyed
+    # by content hash, with an mtime manifest as a fast pre-check.
+    chunks_dir = os.path.join(CENTRAL_INDEX_STORE, "chunks")
+    manifest_path = os.path.join(chunks_dir, "paths.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            manifest = {}
+
     chunk_paths = []
-    chunk_texts = []
-    for fpath, ftext in zip(file_paths, file_texts):
-        for chunk in chunk_text(ftext):
-            chunk_paths.append(fpath)
-            chunk_texts.append(chunk)
+    vec_parts = []       # per-file vector slabs, in discovery order
+    to_embed_texts = []
+    to_embed = []        # (slot in vec_parts, file hash, chunk count)
+    new_manifest = {}
+
+    for fpath, ftext, mtime in zip(file_paths, file_texts, file_mtimes):
+        entry = manifest.get(fpath)
+        if entry and entry[0] == mtime:
+            file_hash = entry[1]
+        else:
+            file_hash = hashlib.sha1(ftext.encode('utf-8', 'replace')).hexdigest()[:16]
+        new_manifest[fpath] = [mtime, file_hash]
+
+        chunks = chunk_text(ftext)
+        slab_path = os.path.join(chunks_dir, f"{file_hash}.npy")
+        if os.path.exists(slab_path):
+            try:
+                slab = np.load(slab_path, allow_pickle=False)
+                if len(slab) == len(chunks):
+                    vec_parts.append(slab)
+                    chunk_paths.extend([fpath] * len(slab))
+                    continue
+            except (OSError, ValueError):
+                pass  # corrupt slab — re-embed below
+
+        to_embed.append((len(vec_parts), file_hash, len(chunks)))
+        vec_parts.append(None)
+        to_embed_texts.extend(chunks)
+        chunk_paths.extend([fpath] * len(chunks))
+
+    query_vec = get_query_vec(query)
+
+    if to_embed_texts:
+        reused = len(file_paths) - len(to_embed)
+        print(f"Embedding {len(to_embed)} files ({len(to_embed_texts)} chunks, "
+              f"{reused} unchanged reused)...", file=sys.stderr)
+        new_vecs = normalize_vectors(
+            encode_texts(get_model(), to_embed_texts, show_progress_bar=True))
+
+        os.makedirs(chunks_dir, exist_ok=True)
+        row = 0
+        for slot, file_hash, nchunks in to_embed:
+            slab = new_vecs[row:row + nchunks]
+            row += nchunks
+            vec_parts[slot] = slab
+            try:
+                np.save(os.path.join(chunks_dir, f"{file_hash}.npy"), slab)
+            except OSError:
+                pass  # slab cache is best-effort
 
-    print(f"Embedding {len(file_paths)} files ({len(chunk_texts)} chunks)...", file=sys.stderr)
-    model = get_model()
-    query_vec = model.encode(query)
-    doc_vecs = model.encode(chunk_texts, show_progress_bar=True)
+    try:
+        os.makedirs(chunks_dir, exist_ok=True)
+        # Merge rather than replace — the manifest is shared by scans of
+        # other directories.
+        manifest.update(new_manifest)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+    except OSError:
+        pass
+
+    doc_vecs = vec_parts[0] if len(vec_parts) == 1 else np.concatenate(vec_parts, axis=0)
 
     # Cache the chunked embeddings for future use
     os.makedirs(CENTRAL_INDEX_STORE, exist_ok=True)
-    np.savez_compressed(cache_path, paths=np.array(chunk_paths), vectors=doc_vecs)
+    save_index(cache_path, chunk_paths, doc_vecs)
     print(f"Cached index saved: {cache_path}", file=sys.stderr)
 
-    scores = cosine_similarity(query_vec, doc_vecs)
+    scores = cosine_scores(query_vec, doc_vecs, normalized=True)
+
+    k = min(len(scores), top_k * 4)
+    top_idx = np.argpartition(scores, -k)[-k:]
+    top_idx = top_idx[scores[top_idx] >= threshold]
 
-    results = []
-    for i, score in enumerate(scores):
-        if score >= threshold:
-            results.append({"path": str(chunk_paths[i]), "score": float(score), "index": cache_name})
+    results = [{"path": str(chunk_paths[i]), "score": float(scores[i]), "index": cache_name}
+               for i in top_idx]
 
     # Deduplicate: keep highest-scoring chunk per file
     results.sort(key=lambda x: x["score"], reverse=True)
-    seen = set()
-    unique = []
-    for r in results:
-        if r["path"] not in seen:
-            unique.append(r)
-            seen.add(r["path"])
-        if len(unique) >= top_k:
-            break
-
-    return unique
+    return dedup_top_k(results, top_k)
 
 
 def remove_index(index_name, vault_path=None):
@@ -313,27 +533,25 @@ def remove_index(index_name, vault_path=None):
             print("Error: Removing vault index requires --vault_path or OBSIDIAN_VAULT_PATH.", file=sys.stderr)
             return False
         vault_cache = os.path.join(vault_path, ".smart-env", "scripts", "vault_cache.npz")
-        if os.path.exists(vault_cache):
-            try:
-                os.remove(vault_cache)
+        try:
+            if delete_index_files(vault_cache):
                 print(f"Removed vault index cache: {vault_cache}")
                 success = True
-            except OSError as e:
-                print(f"Error removing vault index: {e}", file=sys.stderr)
-        else:
-            print("Vault index not found.")
+            else:
+                print("Vault index not found.")
+        except OSError as e:
+            print(f"Error removing vault index: {e}", file=sys.stderr)
 
     elif os.path.exists(CENTRAL_INDEX_STORE):
-        path = os.path.join(CENTRAL_INDEX_STORE, f"{index_name}.npz")
-        if os.path.exists(path):
-            try:
-                os.remove(path)
+        path = os.path.join(CENTRAL_INDEX_STORE, index_name)
+        try:
+            if delete_index_files(path):
                 print(f"Removed index '{index_name}' from store ({path}).")
                 success = True
-            except OSError as e:
-                print(f"Error removing index '{index_name}': {e}", file=sys.stderr)
-        else:
-            print(f"Index '{index_name}' not found in store.")
+            else:
+                print(f"Index '{index_name}' not found in store.")
+        except OSError as e:
+            print(f"Error removing index '{index_name}': {e}", file=sys.stderr)
     else:
         print(f"Index store {CENTRAL_INDEX_STORE} does not exist.")
 
@@ -346,49 +564,33 @@ def remove_index(index_name, vault_path=None):
 
 def list_indices(vault_cache):
     """List all available indices with metadata."""
+    import numpy as np
     from datetime import datetime
 
     indices = []
+    candidates = []
 
-    # Check vault cache
-    if os.path.exists(vault_cache):
+    # Check vault cache, then the central store
+    if index_exists(vault_cache):
+        candidates.append(("vault", vault_cache))
+    candidates.extend(list_store_indices(CENTRAL_INDEX_STORE))
+
+    for name, path in candidates:
         try:
-            data = np.load(vault_cache, allow_pickle=False)
-            stat = os.stat(vault_cache)
-            total = len(data["paths"])
-            unique = len(set(str(p) for p in data["paths"]))
+            # mmap keeps this metadata-only: vectors are never paged in,
+            # only the (small) paths array is read to count unique files.
+            paths, vectors, _ = load_index(path)
+            mtime = index_mtime(path)
             indices.append({
-                "name": "vault",
-                "path": vault_cache,
-                "files": unique,
-                "chunks": total,
-                "size_kb": stat.st_size // 1024,
-                "modified": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M"),
+                "name": name,
+                "path": path,
+                "files": int(np.unique(paths).size),
+                "chunks": vectors.shape[0],
+                "size_kb": index_size_bytes(path) // 1024,
+                "modified": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M"),
             })
         except (OSError, ValueError):
-            pass
-
-    # Check central store
-    if os.path.exists(CENTRAL_INDEX_STORE):
-        for f in os.listdir(CENTRAL_INDEX_STORE):
-            if f.endswith(".npz"):
-                path = os.path.join(CENTRAL_INDEX_STORE, f)
-                name = f.replace(".npz", "")
-                try:
-                    data = np.load(path, allow_pickle=False)
-                    stat = os.stat(path)
-                    total = len(data["paths"])
-                    unique = len(set(str(p) for p in data["paths"]))
-                    indices.append({
-                        "name": name,
-                        "path": path,
-                        "files": unique,
-                        "chunks": total,
-                        "size_kb": stat.st_size // 1024,
-                        "modified": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M"),
-                    })
-                except (OSError, ValueError):
-                    continue
+            continue
 
     if not indices:
         print("No indices found.")
@@ -490,11 +692,7 @@ if __name__ == "__main__":
 
         # Build index list
         indices = [("vault", vault_cache)]
-        if os.path.exists(CENTRAL_INDEX_STORE):
-            for f in os.listdir(CENTRAL_INDEX_STORE):
-                if f.endswith(".npz"):
-                    name = f.replace(".npz", "")
-                    indices.append((name, os.path.join(CENTRAL_INDEX_STORE, f)))
+        indices.extend(list_store_indices(CENTRAL_INDEX_STORE))
 
         # Filter by requested index if specified (or use default)
         effective_index = args.index or DEFAULT_INDEX
@@ -1,108 +1,306 @@
 import os
+
+# Cap BLAS/OpenMP pools before numpy or torch are imported (they read
+# these once at load). The defaults spawn a thread per core, which
+# oversubscribes a laptop already running Obsidian and trades latency
+# for context-switch storms; four threads saturate the tiny encoder.
+ENCODE_THREADS = int(os.environ.get("SMART_SEARCH_THREADS", "4"))
+os.environ.setdefault("OMP_NUM_THREADS", str(ENCODE_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(ENCODE_THREADS))
+os.environ.setdefault("OPENBLAS_NUM_THREADS", str(ENCODE_THREADS))
+
 import json
 import signal
 import socket
 import sys
-
+import threading
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from shared import (
-    DAEMON_HOST,
-    DAEMON_PORT,
+    DAEMON_SOCKET,
     CENTRAL_INDEX_STORE,
     DEFAULT_THRESHOLD,
     MAX_QUERY_LENGTH,
     MODEL_NAME,
-    cosine_similarity,
-    hybrid_boost,
+    get_model,
+    normalize_vectors,
+    hybrid_boost_arrays,
+    lower_path_arrays,
+    load_index,
+    index_exists,
+    list_store_indices,
+    daemon_listen_socket,
+    send_frame,
+    recv_frame,
+    reply_packer,
+    unpack_message,
 )
+from scoring import cosine_scores, clear_gpu_cache
 
 
 class SearchDaemon:
     def __init__(self, vault_path):
         self.vault_path = vault_path
         self.vault_cache = os.path.join(vault_path, ".smart-env", "scripts", "vault_cache.npz")
-        self.indices = {}  # name -> {paths, vectors}
+        self.indices = {}  # name -> views into the concatenated arrays
+        self._all = None   # concatenated cross-index arrays (+ labels)
         self._running = True
+        # SentenceTransformer's forward pass is not reentrant-safe across
+        # threads; serialize encodes while letting socket I/O interleave.
+        self._encode_lock = threading.Lock()
+        # Typeahead repeats queries constantly: keep encoded query vectors
+        # in a small LRU, and memo the last full search keyed by an epoch
+        # that reload_all_indices bumps.
+        self._query_vecs = OrderedDict()
+        self._epoch = 0
+        self._last_search = None  # (request key, results)
 
         print(f"Loading weights for {MODEL_NAME}...")
-        os.environ["TRANSFORMERS_OFFLINE"] = "1"
-        os.environ["HF_HUB_OFFLINE"] = "1"
-        from sentence_transformers import SentenceTransformer
-        self.model = SentenceTransformer(MODEL_NAME, local_files_only=True)
+        self.model = get_model()
+        self._pin_torch_threads()
 
         self.reload_all_indices()
 
+    def _pin_torch_threads(self):
+        """Cap torch's intraop/interop pools to match the env caps above.
+
+        torch sizes its pools at import, ignoring env vars set later by
+        a parent process; the ONNX backend has no torch pools to pin.
+        """
+        try:
+            import torch
+        except ImportError:
+            return
+        try:
+            torch.set_num_threads(ENCODE_THREADS)
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # interop count can only be set once per process
+
     def reload_all_indices(self):
         print("Refreshing all indices...")
-        new_indices = {}
 
-        # 1. Load vault index
-        if os.path.exists(self.vault_cache):
+        # 1. Vault index, then the central store
+        to_load = []
+        if index_exists(self.vault_cache):
+            to_load.append(("vault", self.vault_cache))
+        to_load.extend(list_store_indices(CENTRAL_INDEX_STORE))
+
+        names = []
+        vectors_list = []
+        paths_list = []
+        for name, path in to_load:
             try:
-                data = np.load(self.vault_cache, allow_pickle=False)
-                new_indices["vault"] = {"paths": data["paths"], "vectors": data["vectors"]}
-                print(f"Loaded 'vault' ({len(data['paths'])} vectors)")
+                paths, vectors, normalized = load_index(path)
+                # Target norms never change after load, so legacy caches
+                # are unit-normalized once here; every query then scores
+                # with a single dot — no per-query norm pass over the
+                # matrix.
+                if not normalized:
+                    vectors = normalize_vectors(vectors)
+                names.append(name)
+                vectors_list.append(np.asarray(vectors))
+                paths_list.append(np.asarray(paths))
+                print(f"Loaded '{name}' ({len(paths)} vectors)")
             except Exception as e:
-                print(f"Error loading vault cache: {e}")
-
-        # 2. Load central store indices
-        if os.path.exists(CENTRAL_INDEX_STORE):
-            for f in os.listdir(CENTRAL_INDEX_STORE):
-                if f.endswith(".npz"):
-                    name = f.replace(".npz", "")
-                    path = os.path.join(CENTRAL_INDEX_STORE, f)
-                    try:
-                        data = np.load(path, allow_pickle=False)
-                        new_indices[name] = {"paths": data["paths"], "vectors": data["vectors"]}
-                        print(f"Loaded '{name}' ({len(data['paths'])} vectors)")
-                    except Exception as e:
-                        print(f"Error loading {name}: {e}")
+                print(f"Error loading {name}: {e}")
+
+        # The daemon scores every index on most queries, so all vectors
+        # are concatenated into one resident matrix: a single GEMV per
+        # query instead of one BLAS dispatch per index. Targeted
+        # searches slice views out of the same buffers — no copies.
+        # Lowercased path/basename arrays are computed once here so
+        # hybrid scoring never re-lowercases per query.
+        #
+        # Everything is built into locals and published with single
+        # assignments at the end: reload runs on a pool worker while
+        # searches are in flight, so partially-rebuilt state must never
+        # be visible.
+        new_indices = {}
+        new_all = None
+        gen = self._epoch + 1  # published as the new epoch below
+        if names:
+            counts = [len(p) for p in paths_list]
+            all_vectors = (vectors_list[0] if len(names) == 1
+                           else np.concatenate(vectors_list, axis=0))
+            all_paths = (paths_list[0] if len(names) == 1
+                         else np.concatenate(paths_list))
+            paths_lower, basenames = lower_path_arrays(all_paths)
+            new_all = {
+                "vectors": all_vectors,
+                "paths": all_paths,
+                "paths_lower": paths_lower,
+                "basenames_lower": basenames,
+                "labels": np.repeat(np.array(names), counts),
+                "gen": gen,
+            }
+            offset = 0
+            for name, count in zip(names, counts):
+                sl = slice(offset, offset + count)
+                new_indices[name] = {"vectors": all_vectors[sl],
+                                     "paths": all_paths[sl],
+                                     "paths_lower": paths_lower[sl],
+                                     "basenames_lower": basenames[sl],
+                                     "gen": gen}
+                offset += count
 
         self.indices = new_indices
+        self._all = new_all
+        self._epoch = gen  # invalidates the last-search memo
+        # GPU cache keys carry each dict's generation, so an in-flight
+        # search can never score a matrix uploaded for another
+        # generation; clearing here just frees old device memory.
+        clear_gpu_cache()
         print("Ready.")
 
+    def _encode_query(self, query):
+        """Encode *query* to a unit vector, serving repeats from an LRU.
+
+        The query is normalized once here, so with unit-normalized
+        targets the whole scoring pass is a pure dot product — the
+        downstream query-norm division becomes a divide by 1.
+        """
+        vec = self._query_vecs.get(query)
+        if vec is not None:
+            self._query_vecs.move_to_end(query)
+            return vec
+        with self._encode_lock:
+            vec = self.model.encode(query)
+        vec = vec / max(float(np.linalg.norm(vec)), 1e-10)
+        self._query_vecs[query] = vec
+        while len(self._query_vecs) > 1024:
+            self._query_vecs.popitem(last=False)
+        return vec
+
     def handle_search(self, query, top_k=20, threshold=DEFAULT_THRESHOLD,
                       scope=None, target_index=None, hybrid=False):
-        query_vec = self.model.encode(query)
-        all_results = []
-
-        # For hybrid mode, pre-compute query words
-        query_words = query.lower().split() if hybrid else []
-
-        # Filter indices to search (--index all or absent → search everything)
-        to_search = self.indices.items()
-        if target_index and target_index.lower() != "all" and target_index in self.indices:
-            to_search = [(target_index, self.indices[target_index])]
+        request_key = (query, top_k, threshold, scope, target_index, hybrid, self._epoch)
+        memo = self._last_search
+        if memo is not None and memo[0] == request_key:
+            return memo[1]
+
+        # One matrix, one GEMV: the usual "search everything" case scores
+        # the concatenated cross-index matrix in a single cosine_scores
+        # call; a targeted index scores a view sliced from the same
+        # buffers. Candidates stay as parallel arrays until the final
+        # <= top_k rows are materialized as dicts.
+        #
+        # State is snapshotted into locals up front: a concurrent reload
+        # swaps self.indices/self._all wholesale, and everything below
+        # must come from one generation. The GPU cache key includes the
+        # dict's own generation so a matrix uploaded for an older
+        # generation can never be scored against newer path arrays.
+        indices = self.indices
+        if target_index and target_index.lower() != "all" and target_index in indices:
+            data = indices[target_index]
+            labels = None
+        else:
+            data = self._all
+            labels = data["labels"] if data else None
 
-        for label, data in to_search:
-            paths = data["paths"]
-            vectors = data["vectors"]
-            scores = cosine_similarity(query_vec, vectors)
+        unique = []
+        if data is not None and len(data["paths"]):
+            cache_key = (target_index if labels is None else "all", data["gen"])
+            query_vec = self._encode_query(query)
+            scores = cosine_scores(query_vec, data["vectors"], normalized=True,
+                                   cache_key=cache_key)
+
+            if hybrid:
+                query_words = query.lower().split()
+                boosts = hybrid_boost_arrays(data["paths_lower"],
+                                             data["basenames_lower"], query_words)
+                effective = np.minimum(1.0, scores.astype(np.float32, copy=False) + boosts)
+            else:
+                effective = scores
+
+            cand = np.nonzero(effective >= threshold)[0]
+            if scope and cand.size:
+                cand = cand[np.char.find(data["paths_lower"][cand], scope.lower()) >= 0]
+            # Partition down to a small candidate set before sorting —
+            # top_k*4 leaves headroom for dedup to discard rows.
+            k = min(top_k * 4, cand.size)
+            if k and cand.size > k:
+                cand = cand[np.argpartition(-effective[cand], k - 1)[:k]]
+            if cand.size:
+                cand = cand[np.argsort(-effective[cand], kind="stable")]
+                # Keep the best row per path (first occurrence after the
+                # score sort), then materialize dicts for the winners.
+                _, first = np.unique(data["paths"][cand], return_index=True)
+                winners = cand[np.sort(first)[:top_k]]
+                unique = [{"path": str(data["paths"][i]),
+                           "score": float(effective[i]),
+                           "index": (target_index if labels is None
+                                     else str(labels[i]))}
+                          for i in winners]
+
+        self._last_search = (request_key, unique)
+        return unique
 
-            for i, score in enumerate(scores):
-                path = str(paths[i])
-                effective_score = float(score)
+    def _serve_connection_threaded(self, conn):
+        with conn:
+            self._serve_connection(conn)
 
-                if hybrid:
-                    effective_score = min(1.0, effective_score + hybrid_boost(path, query_words))
+    def _serve_connection(self, conn):
+        """Serve length-prefixed requests on one connection until it closes.
 
-                if effective_score >= threshold:
-                    if not scope or scope.lower() in path.lower():
-                        all_results.append({"path": path, "score": effective_score, "index": label})
+        Clients keep their connection open across requests (search-as-you-
+        type issues several per second), so this loops reading frames. The
+        idle timeout bounds how long a silent client can hold the daemon.
+        """
+        conn.settimeout(5.0)
 
-        all_results.sort(key=lambda x: x["score"], reverse=True)
+        while self._running:
+            try:
+                data = recv_frame(conn)
+            except (ConnectionError, TimeoutError, ValueError, OSError):
+                return
 
-        seen = set()
-        unique = []
-        for r in all_results:
-            if r["path"] not in seen:
-                unique.append(r)
-                seen.add(r["path"])
-            if len(unique) >= top_k:
-                break
+            # Answer in the codec the request arrived in, so clients
+            # without msgpack never receive a frame they can't parse.
+            pack = reply_packer(data)
+            try:
+                request = unpack_message(data)
+                cmd = request.get("command")
+
+                if cmd == "search":
+                    query = request.get("query", "")
+                    if len(query) > MAX_QUERY_LENGTH:
+                        send_frame(conn, pack(
+                            {"error": f"Query exceeds maximum length of {MAX_QUERY_LENGTH} chars"}
+                        ))
+                        continue
 
-        return unique
+                    results = self.handle_search(
+                        query,
+                        scope=request.get("scope"),
+                        target_index=request.get("index"),
+                        threshold=request.get("threshold", DEFAULT_THRESHOLD),
+                        hybrid=request.get("hybrid", False),
+                    )
+                    send_frame(conn, pack(results))
+
+                elif cmd == "reload":
+                    self.reload_all_indices()
+                    send_frame(conn, b'{"status": "ok"}')
+
+                elif cmd == "ping":
+                    send_frame(conn, b'{"status": "pong"}')
+
+                elif cmd == "stop":
+                    send_frame(conn, b'{"status": "ok", "message": "shutting down"}')
+                    print("Received stop command, shutting down...")
+                    self._running = False
+                    return
+
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                try:
+                    send_frame(conn, pack({"error": str(e)}))
+                except OSError:
+                    return
+            except OSError:
+                return
 
     # ── Graceful shutdown ────────────────────────────────────────────
     def _handle_signal(self, signum, frame):
@@ -114,12 +312,13 @@ class SearchDaemon:
         signal.signal(signal.SIGTERM, self._handle_signal)
         signal.signal(signal.SIGINT, self._handle_signal)
 
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.bind((DAEMON_HOST, DAEMON_PORT))
+        listen_sock, address = daemon_listen_socket()
+        # A few workers let concurrent clients interleave socket I/O with
+        # encoding instead of queueing behind one long-lived connection.
+        with listen_sock as s, ThreadPoolExecutor(max_workers=4) as executor:
             s.listen()
             s.settimeout(1.0)  # Allow periodic check of self._running
-            print(f"Search Daemon listening on {DAEMON_HOST}:{DAEMON_PORT}")
+            print(f"Search Daemon listening on {address}")
 
             while self._running:
                 try:
@@ -127,50 +326,14 @@ class SearchDaemon:
                 except socket.timeout:
                     continue  # Check self._running and loop
 
-                with conn:
-                    try:
-                        raw = conn.recv(4096)
-                        if not raw:
-                            continue
-                        data = raw.decode('utf-8', errors='replace')
-                    except OSError:
-                        continue
+                executor.submit(self._serve_connection_threaded, conn)
 
-                    try:
-                        request = json.loads(data)
-                        cmd = request.get("command")
-
-                        if cmd == "search":
-                            query = request.get("query", "")
-                            if len(query) > MAX_QUERY_LENGTH:
-                                conn.sendall(json.dumps(
-                                    {"error": f"Query exceeds maximum length of {MAX_QUERY_LENGTH} chars"}
-                                ).encode('utf-8'))
-                                continue
-
-                            results = self.handle_search(
-                                query,
-                                scope=request.get("scope"),
-                                target_index=request.get("index"),
-                                threshold=request.get("threshold", DEFAULT_THRESHOLD),
-                                hybrid=request.get("hybrid", False),
-                            )
-                            conn.sendall(json.dumps(results).encode('utf-8'))
-
-                        elif cmd == "reload":
-                            self.reload_all_indices()
-                            conn.sendall(b'{"status": "ok"}')
-
-                        elif cmd == "ping":
-                            conn.sendall(b'{"status": "pong"}')
-
-                        elif cmd == "stop":
-                            conn.sendall(b'{"status": "ok", "message": "shutting down"}')
-                            print("Received stop command, shutting down...")
-                            self._running = False
-
-                    except (json.JSONDecodeError, KeyError, ValueError) as e:
-                        conn.sendall(json.dumps({"error": str(e)}).encode('utf-8'))
+        # Clean up the socket file so the next start doesn't find a stale one
+        if hasattr(socket, "AF_UNIX"):
+            try:
+                os.unlink(DAEMON_SOCKET)
+            except OSError:
+                pass
 
         print("Daemon stopped.")
 
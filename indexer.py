@@ -2,8 +2,7 @@ import os
 import sys
 import time
 import argparse
-
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 from shared import (
     CENTRAL_INDEX_STORE,
@@ -12,32 +11,56 @@ from shared import (
     SKIP_DIRS,
     chunk_text,
     get_model,
+    encode_texts,
+    normalize_vectors,
+    save_index,
+    delete_index_files,
     try_daemon_reload,
 )
 
 
+def _read_one(file_path):
+    """Read one candidate file, returning ``(path, text)``.
+
+    Returns None for oversized, empty, or unreadable files. Runs on a
+    thread pool — the GIL is released during the blocking stat/read
+    syscalls, so reads overlap.
+    """
+    try:
+        size = os.path.getsize(file_path)
+        if size > MAX_FILE_SIZE:
+            print(f"Skipping large file ({size} bytes): {file_path}")
+            return None
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        if not content.strip():
+            return None
+        return file_path, content
+    except OSError:
+        return None
+
+
 def index_directory(directory_path, index_name, central_store):
     model = get_model()
     file_paths = []
     file_texts = []
 
     print(f"Scanning {directory_path}...")
+    candidates = []
     for root, dirs, files in os.walk(directory_path):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         for file in files:
             if file.endswith(INDEXABLE_EXTENSIONS):
-                file_path = os.path.join(root, file)
-                try:
-                    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-                        print(f"Skipping large file ({os.path.getsize(file_path)} bytes): {file_path}")
-                        continue
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                        if content.strip():
-                            file_paths.append(file_path)
-                            file_texts.append(content)
-                except OSError:
-                    continue
+                candidates.append(os.path.join(root, file))
+
+    # Reads overlap across inodes on a thread pool; serial I/O is the
+    # bottleneck on cold caches, not the walk itself.
+    if candidates:
+        with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 4)) as ex:
+            for result in ex.map(_read_one, candidates):
+                if result is not None:
+                    file_paths.append(result[0])
+                    file_texts.append(result[1])
 
     if not file_paths:
         print("No indexable files found.")
@@ -54,13 +77,14 @@ def index_directory(directory_path, index_name, central_store):
 
     print(f"Generating embeddings for {len(file_paths)} files ({len(chunk_texts)} chunks)...")
     start_time = time.time()
-    embeddings = model.encode(chunk_texts, show_progress_bar=True)
+    embeddings = normalize_vectors(
+        encode_texts(model, chunk_texts, show_progress_bar=True))
     duration = time.time() - start_time
 
-    output_path = os.path.join(central_store, f"{index_name}.npz")
+    output_path = os.path.join(central_store, index_name)
     os.makedirs(central_store, exist_ok=True)
 
-    np.savez_compressed(output_path, paths=np.array(chunk_paths), vectors=embeddings)
+    save_index(output_path, chunk_paths, embeddings)
     print(f"Index '{index_name}' saved to {output_path} in {duration:.2f}s")
     print(f"  {len(file_paths)} files → {len(chunk_texts)} chunks")
 
@@ -80,17 +104,16 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args.remove:
-        output_path = os.path.join(args.store, f"{args.remove}.npz")
-        if os.path.exists(output_path):
-            try:
-                os.remove(output_path)
+        output_path = os.path.join(args.store, args.remove)
+        try:
+            if delete_index_files(output_path):
                 print(f"Index '{args.remove}' removed from {output_path}")
                 if try_daemon_reload():
                     print("Notified Search Booster to reload indices.")
-            except OSError as e:
-                print(f"Error removing index: {e}")
-        else:
-            print(f"Index '{args.remove}' not found at {output_path}")
+            else:
+                print(f"Index '{args.remove}' not found at {output_path}")
+        except OSError as e:
+            print(f"Error removing index: {e}")
         sys.exit(0)
 
     if not args.directory_path or not args.index_name:
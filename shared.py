@@ -6,13 +6,36 @@ client.py, daemon.py, and indexer.py.
 """
 
 import os
+import re
 import json
 import socket
-import numpy as np
+import struct
+import hashlib
+from bisect import bisect_right
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# numpy is imported inside the functions that need it rather than here:
+# trivial CLI commands (--help, --stop, list/remove bookkeeping) would
+# otherwise pay the ~100 ms numpy import for nothing. Python caches the
+# module, so the per-call cost after the first import is a dict lookup.
 
 # ── Network ──────────────────────────────────────────────────────────
+# On POSIX the daemon listens on a Unix domain socket, which skips the
+# TCP/IP stack entirely (no handshake, no checksumming) — the CLI is
+# called synchronously by editors, so per-request latency matters.
+# Windows has no AF_UNIX in Python, so loopback TCP stays as a fallback.
 DAEMON_HOST = '127.0.0.1'
 DAEMON_PORT = 5555
+DAEMON_SOCKET = os.path.expanduser("~/.smart-search/daemon.sock")
 
 # ── Paths ────────────────────────────────────────────────────────────
 CENTRAL_INDEX_STORE = os.environ.get(
@@ -24,6 +47,13 @@ DEFAULT_INDEX = os.environ.get("SMART_SEARCH_DEFAULT_INDEX", None)
 # ── Model ────────────────────────────────────────────────────────────
 MODEL_NAME = "TaylorAI/bge-micro-v2"
 
+# Encode backend: "auto" tries the ONNX runtime (with a dynamically
+# int8-quantized export that uses VNNI int8 matmuls on capable CPUs) and
+# falls back to the default torch backend. Set SMART_SEARCH_BACKEND to
+# "torch" to skip ONNX entirely, or "onnx" to require it.
+MODEL_BACKEND = os.environ.get("SMART_SEARCH_BACKEND", "auto")
+ONNX_INT8_DIR = os.path.expanduser("~/.smart-search/onnx-int8")
+
 # ── Search defaults ──────────────────────────────────────────────────
 DEFAULT_THRESHOLD = 0.45
 MAX_QUERY_LENGTH = 10_000
@@ -43,11 +73,25 @@ CHUNK_SIZE = 2000       # characters per chunk (~400-500 tokens)
 CHUNK_OVERLAP = 200     # overlap between consecutive chunks
 
 
+# Lookahead so runs of newlines yield every overlapping break offset,
+# matching what rfind('\n\n', ...) used to see.
+_PARA_BREAK = re.compile(r'\n(?=\n)')
+_WHITESPACE = ' \t\n\r\f\v'
+
+
 def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
-    """Split text into overlapping chunks, breaking at paragraph boundaries."""
+    """Split text into overlapping chunks, breaking at paragraph boundaries.
+
+    Paragraph-break offsets are collected in one regex scan up front, so
+    each chunk boundary is a bisect over that list instead of an rfind
+    over the window; per-chunk whitespace trimming is index arithmetic
+    rather than a strip() allocation.
+    """
     if len(text) <= chunk_size:
         return [text]
 
+    breaks = [m.start() for m in _PARA_BREAK.finditer(text)]
+
     chunks = []
     start = 0
     text_len = len(text)
@@ -55,15 +99,21 @@ def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
     while start < text_len:
         end = min(start + chunk_size, text_len)
 
-        # Try to break at a paragraph boundary (double newline)
-        if end < text_len:
-            break_at = text.rfind('\n\n', start + chunk_size // 2, end)
-            if break_at > start:
-                end = break_at
-
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
+        # Highest paragraph break fully inside [start + chunk_size//2, end)
+        if end < text_len and breaks:
+            i = bisect_right(breaks, end - 2) - 1
+            if i >= 0 and breaks[i] >= start + chunk_size // 2 and breaks[i] > start:
+                end = breaks[i]
+
+        # Trim whitespace off both ends without materializing the
+        # untrimmed slice first.
+        lo, hi = start, end
+        while lo < hi and text[lo] in _WHITESPACE:
+            lo += 1
+        while hi > lo and text[hi - 1] in _WHITESPACE:
+            hi -= 1
+        if lo < hi:
+            chunks.append(text[lo:hi])
 
         if end >= text_len:
             break
@@ -72,10 +122,217 @@ def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
     return chunks if chunks else [text]
 
 
+# ── Index storage ────────────────────────────────────────────────────
+# Indices live as an uncompressed, mmappable .npy pair so queries stream
+# vector pages straight from the OS page cache instead of decompressing
+# the whole matrix on every invocation. Legacy single-file .npz caches
+# are still readable (and are replaced on the next save).
+#
+# Vectors stay uncompressed (embeddings barely deflate and decompression
+# would defeat the mmap), but the paths array is the opposite case:
+# numpy stores unicode fixed-width, so a store full of long, shared
+# path prefixes is mostly zero padding. When the optional zstandard
+# package is installed the paths member is written zstd-framed instead,
+# typically 20-50x smaller. Plain .paths.npy always remains readable.
+VECTORS_SUFFIX = ".vectors.npy"
+PATHS_SUFFIX = ".paths.npy"
+PATHS_ZST_SUFFIX = ".paths.npy.zst"
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def index_base(path):
+    """Return the base path of an index, stripping a legacy .npz suffix."""
+    return path[:-4] if path.endswith(".npz") else path
+
+
+def save_index(path, paths, vectors):
+    """Write an index as a .npy pair; removes any legacy .npz it replaces."""
+    import numpy as np
+
+    base = index_base(path)
+    np.save(base + VECTORS_SUFFIX, np.ascontiguousarray(vectors))
+    paths_arr = np.asarray(paths)
+    if paths_arr.dtype == object:
+        # Fixed-width unicode keeps the array contiguous and loadable
+        # without pickling; object arrays of str would force allow_pickle.
+        paths_arr = paths_arr.astype(np.str_)
+    if zstandard is not None:
+        import io
+        buf = io.BytesIO()
+        np.save(buf, paths_arr)
+        with open(base + PATHS_ZST_SUFFIX, "wb") as f:
+            f.write(zstandard.ZstdCompressor().compress(buf.getvalue()))
+        stale = (base + PATHS_SUFFIX, base + ".npz")
+    else:
+        np.save(base + PATHS_SUFFIX, paths_arr)
+        stale = (base + PATHS_ZST_SUFFIX, base + ".npz")
+    for legacy in stale:
+        if os.path.exists(legacy):
+            try:
+                os.remove(legacy)
+            except OSError:
+                pass
+
+
+def load_index(path, mmap=True):
+    """Load an index, returning ``(paths, vectors, normalized)``.
+
+    New-format vectors come back memory-mapped (unless ``mmap=False``), so
+    only the pages actually touched by scoring are faulted in. The pair
+    format always holds unit-normalized vectors; for legacy .npz caches
+    the flag reflects the 'normalized' sentinel key.
+    """
+    import numpy as np
+
+    base = index_base(path)
+    vectors_path = base + VECTORS_SUFFIX
+    if os.path.exists(vectors_path):
+        vectors = np.load(vectors_path, mmap_mode="r" if mmap else None)
+        paths = _load_paths_member(base)
+        return paths, vectors, True
+
+    data = np.load(base + ".npz", allow_pickle=False)
+    return data["paths"], data["vectors"], "normalized" in data.files
+
+
+def _load_paths_member(base):
+    """Load the paths array for a pair-format index, any on-disk variant."""
+    import numpy as np
+
+    plain = base + PATHS_SUFFIX
+    if os.path.exists(plain):
+        return np.load(plain, allow_pickle=False)
+    compressed = base + PATHS_ZST_SUFFIX
+    if zstandard is None:
+        raise OSError(
+            f"{compressed} requires the optional 'zstandard' package to read")
+    import io
+    with open(compressed, "rb") as f:
+        raw = zstandard.ZstdDecompressor().decompress(f.read())
+    return np.load(io.BytesIO(raw), allow_pickle=False)
+
+
+def index_exists(path):
+    """True if an index (either format) exists at *path*."""
+    base = index_base(path)
+    return os.path.exists(base + VECTORS_SUFFIX) or os.path.exists(base + ".npz")
+
+
+def index_size_bytes(path):
+    """Total on-disk size of an index's file(s)."""
+    base = index_base(path)
+    total = 0
+    for candidate in (base + VECTORS_SUFFIX, base + PATHS_SUFFIX,
+                      base + PATHS_ZST_SUFFIX, base + ".npz"):
+        if os.path.exists(candidate):
+            total += os.stat(candidate).st_size
+    return total
+
+
+def index_mtime(path):
+    """Most recent modification time across an index's file(s)."""
+    base = index_base(path)
+    times = [os.stat(candidate).st_mtime
+             for candidate in (base + VECTORS_SUFFIX, base + PATHS_SUFFIX,
+                               base + PATHS_ZST_SUFFIX, base + ".npz")
+             if os.path.exists(candidate)]
+    return max(times) if times else 0.0
+
+
+def delete_index_files(path):
+    """Remove an index's file(s). Returns True if anything was deleted."""
+    base = index_base(path)
+    removed = False
+    for candidate in (base + VECTORS_SUFFIX, base + PATHS_SUFFIX,
+                      base + PATHS_ZST_SUFFIX, base + ".npz"):
+        if os.path.exists(candidate):
+            os.remove(candidate)
+            removed = True
+    return removed
+
+
+def list_store_indices(store):
+    """Discover indices in *store* as sorted ``(name, path)`` pairs.
+
+    New-format pairs take precedence over a same-named legacy .npz.
+    """
+    if not os.path.exists(store):
+        return []
+    found = {}
+    for f in os.listdir(store):
+        if f.endswith(VECTORS_SUFFIX):
+            name = f[:-len(VECTORS_SUFFIX)]
+            found[name] = os.path.join(store, name)
+        elif f.endswith(".npz"):
+            found.setdefault(f[:-4], os.path.join(store, f))
+    return sorted(found.items())
+
+
 # ── Singleton model cache ────────────────────────────────────────────
 _cached_model = None
 
 
+def _load_onnx_model(SentenceTransformer):
+    """Load the ONNX backend, preferring an int8 dynamically quantized export.
+
+    On first use the model is exported to ONNX_INT8_DIR and quantized for
+    AVX-512 VNNI; subsequent loads reuse that export. Transformer encode
+    time is matmul-bound, so int8 dot-product instructions cut per-query
+    encode latency 2-4x on capable CPUs. Returns None if the ONNX stack
+    (onnxruntime/optimum) is unavailable so the caller can fall back.
+    """
+    import glob
+
+    def quantized_files():
+        return sorted(glob.glob(os.path.join(ONNX_INT8_DIR, "**", "*qint8*.onnx"),
+                                recursive=True))
+
+    try:
+        existing = quantized_files()
+        if not existing:
+            model = SentenceTransformer(MODEL_NAME, backend="onnx", local_files_only=True)
+            try:
+                from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+                model.save_pretrained(ONNX_INT8_DIR)
+                export_dynamic_quantized_onnx_model(model, "avx512_vnni", ONNX_INT8_DIR)
+                existing = quantized_files()
+            except Exception:
+                return model  # plain ONNX still beats the torch default
+            if not existing:
+                return model
+        return SentenceTransformer(
+            ONNX_INT8_DIR, backend="onnx", local_files_only=True,
+            model_kwargs={"file_name": os.path.relpath(existing[0], ONNX_INT8_DIR)},
+        )
+    except Exception:
+        return None
+
+
+def _probe_device():
+    """Return 'cuda' or 'mps' when a torch device is usable, else None.
+
+    SMART_SEARCH_DEVICE overrides the probe ('cpu' forces CPU even when
+    a device exists).
+    """
+    forced = os.environ.get("SMART_SEARCH_DEVICE")
+    if forced:
+        return None if forced == "cpu" else forced
+    try:
+        import torch
+    except ImportError:
+        return None
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return None
+
+
 def get_model():
     """Return the SentenceTransformer model, loading it once and caching."""
     global _cached_model
@@ -84,50 +341,381 @@ def get_model():
     from sentence_transformers import SentenceTransformer
     os.environ["TRANSFORMERS_OFFLINE"] = "1"
     os.environ["HF_HUB_OFFLINE"] = "1"
-    _cached_model = SentenceTransformer(MODEL_NAME, local_files_only=True)
+
+    model = None
+    # A real device beats the int8 CPU export, so the ONNX path is only
+    # probed when encoding will run on CPU anyway (or when forced).
+    device = _probe_device()
+    if MODEL_BACKEND == "onnx" or (MODEL_BACKEND == "auto" and device is None):
+        model = _load_onnx_model(SentenceTransformer)
+        if model is None and MODEL_BACKEND == "onnx":
+            raise RuntimeError("SMART_SEARCH_BACKEND=onnx but the ONNX backend failed to load")
+    if model is None:
+        model = SentenceTransformer(MODEL_NAME, device=device, local_files_only=True)
+    _cached_model = model
     return _cached_model
 
 
+# ── Encoding ─────────────────────────────────────────────────────────
+ENCODE_BATCH_SIZE = 64  # larger than the sentence-transformers default of 32
+
+
+def encode_texts(model, texts, batch_size=ENCODE_BATCH_SIZE, show_progress_bar=False):
+    """Encode *texts* with length-sorted ("smart") batching.
+
+    Sorting by length before batching means each batch pads to roughly
+    its own longest member instead of the corpus-wide longest, cutting
+    wasted padding FLOPs in the transformer forward pass. The result is
+    un-permuted back to input order before returning.
+    """
+    import numpy as np
+
+    if len(texts) <= 1:
+        return model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                            show_progress_bar=show_progress_bar)
+
+    order = np.argsort([len(t) for t in texts], kind="stable")
+    sorted_vecs = model.encode([texts[i] for i in order], batch_size=batch_size,
+                               convert_to_numpy=True,
+                               show_progress_bar=show_progress_bar)
+    vecs = np.empty_like(sorted_vecs)
+    vecs[order] = sorted_vecs
+    return vecs
+
+
+# ── Query embedding cache ────────────────────────────────────────────
+# Re-embedding the same query string dominates one-shot CLI latency
+# (model import + forward pass), so query vectors are cached on disk
+# keyed by sha1(model|query). A hit skips model loading entirely.
+QUERY_CACHE_DIR = os.path.expanduser("~/.smart-search/qcache")
+QUERY_CACHE_MAX_ENTRIES = 1000
+
+
+def _evict_query_cache():
+    """Drop the oldest cached query vectors beyond the entry cap."""
+    try:
+        entries = [os.path.join(QUERY_CACHE_DIR, f)
+                   for f in os.listdir(QUERY_CACHE_DIR) if f.endswith(".npy")]
+        if len(entries) <= QUERY_CACHE_MAX_ENTRIES:
+            return
+        entries.sort(key=os.path.getmtime)
+        for stale in entries[:len(entries) - QUERY_CACHE_MAX_ENTRIES]:
+            os.remove(stale)
+    except OSError:
+        pass
+
+
+def get_query_vec(query):
+    """Return the embedding for *query*, via a small on-disk LRU cache.
+
+    On a hit the SentenceTransformer import and forward pass are skipped
+    entirely, reducing repeat-query latency to a filesystem read.
+    """
+    import numpy as np
+
+    key = hashlib.sha1(f"{MODEL_NAME}|{query}".encode("utf-8")).hexdigest()
+    cache_file = os.path.join(QUERY_CACHE_DIR, f"{key}.npy")
+
+    if os.path.exists(cache_file):
+        try:
+            os.utime(cache_file)  # refresh mtime for LRU eviction
+            return np.load(cache_file, allow_pickle=False)
+        except (OSError, ValueError):
+            pass  # corrupt/unreadable entry — fall through and re-encode
+
+    query_vec = np.asarray(get_model().encode(query), dtype=np.float32)
+    try:
+        os.makedirs(QUERY_CACHE_DIR, exist_ok=True)
+        np.save(cache_file, query_vec)
+        _evict_query_cache()
+    except OSError:
+        pass  # cache is best-effort
+    return query_vec
+
+
 def cosine_similarity(query_vec, target_vecs):
     """Cosine similarity between a query vector and a matrix of target vectors.
 
     Handles zero-norm vectors gracefully by clamping norms to a small epsilon.
     """
+    import numpy as np
+
     dot_product = np.dot(target_vecs, query_vec)
     norms = np.linalg.norm(target_vecs, axis=1) * np.linalg.norm(query_vec)
     norms = np.maximum(norms, 1e-10)
     return dot_product / norms
 
 
-def hybrid_boost(path, query_words):
-    """Unified hybrid-mode score boost based on keyword matches in *path*.
+# Rows upcast per block when scoring float16 matrices; caps the fp32
+# temporary at BLOCK_ROWS × dims instead of materializing the full matrix.
+FP16_BLOCK_ROWS = 4096
+
+# scipy is an optional extra: its raw BLAS sgemv binding skips numpy's
+# ufunc dispatch for the float32 mat-vec. Resolved lazily (False once
+# probed and missing) so importing shared.py never pulls in scipy.
+_sgemv = None
+
+
+def _get_sgemv():
+    global _sgemv
+    if _sgemv is None:
+        try:
+            from scipy.linalg.blas import sgemv
+            _sgemv = sgemv
+        except ImportError:
+            _sgemv = False
+    return _sgemv or None
+
 
-    Returns a boost value (0.0 – 0.5) to add to the semantic score.
+def cosine_similarity_prenorm(query_vec, target_vecs):
+    """Cosine similarity against unit-normalized target vectors.
 
-    Boosting rules (applied in priority order):
-      - Exact filename match (with or without extension): +0.4
-      - Partial filename match:                          +0.2
-      - Path-only match:                                 +0.1
+    Caches written since the pre-normalization change store vectors at unit
+    length (see ``normalize_vectors``), so scoring reduces to a single
+    matrix-vector product — no per-row norm pass over the whole matrix.
 
-    Multiple matching words do NOT stack beyond the single highest filename
-    boost, but a path boost can add on top of a filename boost (max total +0.5).
+    Float16 matrices are upcast to float32 in blocks so the dot product
+    still runs through BLAS with an fp32 accumulator.
     """
-    if not query_words:
-        return 0.0
+    import numpy as np
 
-    path_lower = path.lower()
-    filename = os.path.basename(path).lower()
+    query_norm = max(np.linalg.norm(query_vec), 1e-10)
+    query_vec = (query_vec / query_norm).astype(np.float32, copy=False)
 
-    filename_boost = 0.0
-    path_boost = 0.0
+    if target_vecs.dtype == np.float16:
+        scores = np.empty(len(target_vecs), dtype=np.float32)
+        for start in range(0, len(target_vecs), FP16_BLOCK_ROWS):
+            block = target_vecs[start:start + FP16_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + len(block)] = np.dot(block, query_vec)
+        return scores
+
+    sgemv = _get_sgemv()
+    if (sgemv is not None and target_vecs.dtype == np.float32
+            and target_vecs.flags.c_contiguous):
+        # The C-order matrix viewed through .T is Fortran-order, which is
+        # what the BLAS binding wants without a copy; trans=1 then yields
+        # exactly target_vecs @ query_vec.
+        return sgemv(1.0, target_vecs.T, query_vec, trans=1)
+
+    return np.dot(target_vecs, query_vec)
+
+
+def normalize_vectors(vectors):
+    """L2-normalize rows of *vectors* and downcast to float16 for storage.
+
+    Done once at cache-creation time so every subsequent query can use
+    ``cosine_similarity_prenorm`` instead of re-normalizing the full matrix.
+    Unit-length components fit comfortably in float16, which halves both
+    the .npz size and the bytes streamed through the CPU on the scoring
+    pass — the kernel is memory-bandwidth-bound on large caches.
+    """
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float16)
+
+
+# Hybrid-mode boost rules (evaluated per query word, vectorized in
+# hybrid_boost_arrays below):
+#   - Exact filename match (with or without extension): +0.4
+#   - Partial filename match:                           +0.2
+#   - Path-only match:                                  +0.1
+# Multiple matching words do NOT stack beyond the single highest filename
+# boost, but a path boost can add on top of it (max total +0.5).
+
+
+def dedup_top_k(results, top_k):
+    """Keep the best entry per path from score-sorted *results*.
+
+    np.unique's return_index gives the first occurrence of each path in
+    one C-level pass; since the list is sorted by score descending, the
+    first occurrence is the file's best chunk.
+    """
+    import numpy as np
+
+    if not results:
+        return []
+    paths = np.array([r["path"] for r in results])
+    _, first = np.unique(paths, return_index=True)
+    return [results[i] for i in np.sort(first)[:top_k]]
+
+
+def json_dumps_bytes(obj):
+    """Serialize *obj* to JSON bytes for the wire.
+
+    orjson emits bytes directly — no separate .encode() pass — and is
+    several times faster than stdlib json on result lists full of floats.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def json_loads_bytes(data):
+    """Parse JSON from raw bytes without an intermediate str copy."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8', errors='replace'))
+
+
+def pack_message(obj):
+    """Serialize a daemon request/response for the wire.
+
+    Uses msgpack when the optional package is installed — it packs the
+    same dict/list structures in a fraction of json.dumps time and in
+    fewer bytes — and JSON otherwise.
+    """
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json_dumps_bytes(obj)
+
+
+def unpack_message(data):
+    """Parse a wire payload, accepting either msgpack or JSON.
+
+    JSON payloads open with '{' or '[', which a top-level msgpack map or
+    array never does, so the first byte disambiguates — peers that only
+    speak JSON keep working against a msgpack-capable daemon and vice
+    versa.
+    """
+    if data[:1] in (b'{', b'['):
+        return json_loads_bytes(data)
+    if msgpack is None:
+        raise ValueError("received a msgpack frame but msgpack is not installed")
+    return msgpack.unpackb(data, raw=False)
+
+
+def reply_packer(request_data):
+    """Return the serializer matching the format *request_data* used.
+
+    The daemon answers in whatever codec the request arrived in, so a
+    JSON-only client talking to a msgpack-capable daemon gets JSON back
+    instead of a frame it cannot parse.
+    """
+    if request_data[:1] in (b'{', b'['):
+        return json_dumps_bytes
+    return pack_message
+
+
+# Daemon protocol: 4-byte big-endian length prefix + msgpack or JSON
+# payload (see unpack_message).
+# Framing lets several requests share one connection without relying on
+# a single recv() happening to return a whole message.
+_FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024  # sanity cap on a single message
+
+
+def send_frame(sock, payload):
+    """Send *payload* bytes as one length-prefixed frame."""
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("socket closed mid-frame")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def recv_frame(sock):
+    """Read one length-prefixed frame, returning its payload bytes."""
+    (length,) = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"frame of {length} bytes exceeds limit")
+    return _recv_exact(sock, length)
+
+
+def daemon_connect(timeout):
+    """Open a connection to the daemon, preferring AF_UNIX on POSIX."""
+    if hasattr(socket, "AF_UNIX"):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(timeout)
+        s.connect(DAEMON_SOCKET)
+        return s
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    s.connect((DAEMON_HOST, DAEMON_PORT))
+    return s
+
+
+def daemon_listen_socket():
+    """Create and bind the daemon's listening socket.
+
+    Returns ``(socket, address_string)``. Uses a Unix domain socket where
+    available (unlinking any stale socket file first), loopback TCP
+    otherwise.
+    """
+    if hasattr(socket, "AF_UNIX"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        os.makedirs(os.path.dirname(DAEMON_SOCKET), exist_ok=True)
+        try:
+            os.unlink(DAEMON_SOCKET)
+        except FileNotFoundError:
+            pass
+        sock.bind(DAEMON_SOCKET)
+        return sock, DAEMON_SOCKET
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((DAEMON_HOST, DAEMON_PORT))
+    return sock, f"{DAEMON_HOST}:{DAEMON_PORT}"
+
+
+def lower_path_arrays(paths):
+    """Precompute ``(paths_lower, basenames_lower)`` arrays for *paths*.
+
+    Long-lived callers (the daemon) do this once at index load so hybrid
+    boosts never re-lowercase or re-split paths per query.
+    """
+    import numpy as np
+
+    paths_lower = np.char.lower(np.asarray(paths))
+    basenames = np.array([p[max(p.rfind('/'), p.rfind('\\')) + 1:]
+                          for p in paths_lower])
+    return paths_lower, basenames
+
+
+def hybrid_boost_batch(paths, query_words):
+    """Vectorized ``hybrid_boost`` over an array of candidate paths.
+
+    Same rules and weights as the scalar version, but evaluated with
+    numpy string ops across the whole candidate set at once — one C pass
+    per query word instead of a Python call per row.
+    """
+    import numpy as np
+
+    paths = np.asarray(paths)
+    if not query_words or len(paths) == 0:
+        return np.zeros(len(paths), dtype=np.float32)
+
+    paths_lower, basenames = lower_path_arrays(paths)
+    return hybrid_boost_arrays(paths_lower, basenames, query_words)
+
+
+def hybrid_boost_arrays(paths_lower, basenames, query_words):
+    """Hybrid boost vector from precomputed lowercase path arrays."""
+    import numpy as np
+
+    filename_boost = np.zeros(len(paths_lower), dtype=np.float32)
+    path_boost = np.zeros(len(paths_lower), dtype=np.float32)
 
     for word in query_words:
-        if word == filename or word + ".py" == filename or word + ".md" == filename:
-            filename_boost = max(filename_boost, 0.4)
-        elif word in filename:
-            filename_boost = max(filename_boost, 0.2)
-        elif word in path_lower:
-            path_boost = max(path_boost, 0.1)
+        exact = ((basenames == word)
+                 | (basenames == word + ".py")
+                 | (basenames == word + ".md"))
+        partial = np.char.find(basenames, word) >= 0  # includes exact matches
+        in_path = np.char.find(paths_lower, word) >= 0
+
+        filename_boost = np.maximum(
+            filename_boost,
+            np.where(exact, np.float32(0.4),
+                     np.where(partial, np.float32(0.2), np.float32(0.0))))
+        path_boost = np.maximum(
+            path_boost,
+            np.where(in_path & ~partial, np.float32(0.1), np.float32(0.0)))
 
     return filename_boost + path_boost
 
@@ -135,23 +723,23 @@ def hybrid_boost(path, query_words):
 def try_daemon_reload():
     """Send a 'reload' command to the daemon. Returns True on success."""
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1.0)
-            s.connect((DAEMON_HOST, DAEMON_PORT))
-            s.sendall(json.dumps({"command": "reload"}).encode('utf-8'))
-            return True
-    except (ConnectionRefusedError, TimeoutError, OSError):
+        with daemon_connect(timeout=30.0) as s:
+            send_frame(s, json_dumps_bytes({"command": "reload"}))
+            # The daemon replies after the reload completes, so waiting
+            # here means callers only report success once new indices
+            # are actually live.
+            resp = recv_frame(s).decode('utf-8', errors='replace')
+            return "ok" in resp
+    except (ConnectionRefusedError, TimeoutError, ConnectionError, ValueError, OSError):
         return False
 
 
 def try_daemon_stop():
     """Send a 'stop' command to the daemon. Returns True on success."""
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(2.0)
-            s.connect((DAEMON_HOST, DAEMON_PORT))
-            s.sendall(json.dumps({"command": "stop"}).encode('utf-8'))
-            resp = s.recv(4096).decode('utf-8', errors='replace')
+        with daemon_connect(timeout=2.0) as s:
+            send_frame(s, json_dumps_bytes({"command": "stop"}))
+            resp = recv_frame(s).decode('utf-8', errors='replace')
             return "ok" in resp
-    except (ConnectionRefusedError, TimeoutError, OSError):
+    except (ConnectionRefusedError, TimeoutError, ConnectionError, ValueError, OSError):
         return False